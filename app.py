@@ -9,15 +9,32 @@ Entry point.
 from backend.config import SERVER_PORT
 from backend.data import download_data
 from backend import handlers
+from backend.kernels import warm_up
 from pylinkjs import PyLinkJS
 
 
-def main():
-    """Bootstrap the app: fetch data, register handlers, start the server."""
+def refresh_data():
+    """
+    Download/cache data and recompute everything derived from it.
+
+    download_data clears the load/filter caches; ready's defaults are refreshed
+    here too, so always re-download through this function.
+    """
     print("Downloading stock data for all tickers...")
     download_data()
     print("Download complete.")
 
+    # Defaults sent to every page load depend only on the downloaded data
+    handlers.refresh_defaults()
+
+
+def main():
+    """Bootstrap the app: fetch data, register handlers, start the server."""
+    refresh_data()
+
+    # Compile numeric kernels now rather than on the first stat request
+    warm_up()
+
     # Register Python functions that can be invoked from the frontend via call_py(...)
     PyLinkJS.ready = handlers.ready
     PyLinkJS.get_plot_data = handlers.get_plot_data
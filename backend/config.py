@@ -2,6 +2,7 @@
 Configuration values.
 
 - Ticker Download Config: TICKERS, DOWNLOAD_PERIOD, DOWNLOAD_INTERVAL, DATA_DIR
+- Cache Freshness: CACHE_MAX_AGE_HOURS, FORCE_REDOWNLOAD
 - SERVER_PORT
 - Creates DATA_DIR to ensure it exists at import time 
 """
@@ -14,6 +15,10 @@ DOWNLOAD_PERIOD = "1y"    # lookback window before "now"
 DOWNLOAD_INTERVAL = "1d"  # daily sampling
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 
+# Cache Freshness
+CACHE_MAX_AGE_HOURS = 12  # cached files younger than this are not re-downloaded
+FORCE_REDOWNLOAD = os.environ.get("FORCE_REDOWNLOAD", "") not in ("", "0")
+
 # Server
 SERVER_PORT = int(os.environ.get("PORT", 8300))
 
@@ -1,81 +1,187 @@
 """
 Data access layer.
 
-- download_data: fetch and cache CSVs per ticker (auto-adjusted prices).
-- load_data: load a single ticker's CSV into a DataFrame.
+- download_data: fetch and cache Parquet files per ticker (auto-adjusted prices).
+- cache_path: location of a ticker's cached Parquet file.
+- load_data: load (and memoize) a single ticker's cached Date/Close columns.
+- parse_date: memoized ISO date string -> Timestamp.
 - filter_by_date: return rows within [start, end] inclusive.
+- get_filtered: memoized load_data + filter_by_date for a (ticker, start, end).
 """
 
 import os
+import time
+from functools import lru_cache
 import pandas as pd
-import yfinance as yf
-from .config import TICKERS, DATA_DIR, DOWNLOAD_PERIOD, DOWNLOAD_INTERVAL
+from .config import (
+    TICKERS, DATA_DIR, DOWNLOAD_PERIOD, DOWNLOAD_INTERVAL,
+    CACHE_MAX_AGE_HOURS, FORCE_REDOWNLOAD
+)
 
+MAX_SYMBOLS_PER_REQUEST = 20  # Yahoo accepts up to this many symbols per call
+CACHE_COLUMNS = ["Date", "Close"]  # the only columns handlers read
 
-def download_data():
+
+def cache_path(ticker):
+    """Return the path of a ticker's cached Parquet file."""
+    return os.path.join(DATA_DIR, f"{ticker}.parquet")
+
+
+def _is_fresh(ticker):
+    """Return True if the ticker's cache exists and is younger than CACHE_MAX_AGE_HOURS."""
+    path = cache_path(ticker)
+    if not os.path.exists(path):
+        return False
+    return time.time() - os.path.getmtime(path) < CACHE_MAX_AGE_HOURS * 3600
+
+
+def _download_batch(tickers):
     """
-    Download historical data for each configured ticker and cache to CSV.
+    Fetch several tickers with one yf.download call and cache each to Parquet.
 
-    Notes:
-        - Skips tickers that return an empty DataFrame.
-        - Uses yfinance auto_adjust=True for adjusted prices.
-        - Keeps errors non-fatal so one bad ticker doesn't stop the rest.
+    yfinance still issues one request per symbol, but runs them concurrently
+    on its own threads. The result is grouped by ticker (MultiIndex columns),
+    so each symbol's sub-frame is split out and written separately.
     """
-    for ticker in TICKERS:
+    # Imported lazily: yfinance is slow to import and only needed for downloads
+    import yfinance as yf
+
+    df = yf.download(
+        " ".join(tickers),
+        period=DOWNLOAD_PERIOD,
+        interval=DOWNLOAD_INTERVAL,
+        auto_adjust=True,
+        group_by="ticker",
+        progress=False
+    )
+
+    for ticker in tickers:
         try:
-            df = yf.download(
-                ticker,
-                period=DOWNLOAD_PERIOD,
-                interval=DOWNLOAD_INTERVAL,
-                auto_adjust=True,
-                progress=False
-            )
-            if df.empty:
-                print(f"Warning: no data for {ticker}, skipping.")
-                continue
+            # Older yfinance returns flat columns when only one symbol is requested
+            sub = df[ticker] if isinstance(df.columns, pd.MultiIndex) else df
+        except KeyError:
+            print(f"Warning: no data for {ticker}, skipping.")
+            continue
+
+        # Missing symbols come back as all-NaN columns rather than an error
+        sub = sub.dropna(how="all")
+        if sub.empty:
+            print(f"Warning: no data for {ticker}, skipping.")
+            continue
 
+        try:
             # Persist for later reads to avoid repeated API calls
-            df.reset_index(inplace=True)  # ensure 'Date' is a column
-            csv_path = os.path.join(DATA_DIR, f"{ticker}.csv")
-            df.to_csv(csv_path, index=False)
+            sub = sub.reset_index()  # ensure 'Date' is a column
+            # Handlers only read Date/Close; float32 keeps ~7 significant digits
+            sub = sub[CACHE_COLUMNS].astype({"Close": "float32"})
+            # Store Date as tz-naive datetime64 so load_data never parses/converts it
+            dates = pd.to_datetime(sub["Date"])
+            if dates.dt.tz is not None:
+                dates = dates.dt.tz_localize(None)
+            sub["Date"] = dates
+            sub.to_parquet(cache_path(ticker), engine="pyarrow", compression="snappy", index=False)
         except Exception as e:
             print(f"Error downloading {ticker}: {e}")
 
 
+def download_data():
+    """
+    Download historical data for the configured tickers and cache to Parquet.
+
+    Notes:
+        - Tickers with a fresh cache are skipped unless FORCE_REDOWNLOAD is set.
+        - One yf.download call per batch; its symbols are fetched concurrently.
+        - Skips tickers that return no rows.
+        - Uses yfinance auto_adjust=True for adjusted prices.
+        - Keeps errors non-fatal so one bad ticker/batch doesn't stop the rest.
+    """
+    stale = [t for t in TICKERS if FORCE_REDOWNLOAD or not _is_fresh(t)]
+    if not stale:
+        print("Cached data is up to date, skipping download.")
+        return
+
+    for i in range(0, len(stale), MAX_SYMBOLS_PER_REQUEST):
+        batch = stale[i:i + MAX_SYMBOLS_PER_REQUEST]
+        try:
+            _download_batch(batch)
+        except Exception as e:
+            print(f"Error downloading {', '.join(batch)}: {e}")
+
+    # Cached frames may now be stale
+    load_data.cache_clear()
+    get_filtered.cache_clear()
+
+
+@lru_cache(maxsize=len(TICKERS) * 2)
 def load_data(ticker):
     """
-    Load cached CSV for a ticker.
+    Load cached Parquet data for a ticker.
+
+    Only Date and Close (float32) are cached; Parquet keeps Date as a native
+    datetime64 column, so no date parsing is needed. Results are memoized per
+    ticker (cleared by download_data), so callers share the same DataFrame
+    and must not mutate it in place.
 
     Args:
         ticker: Ticker symbol (e.g., 'AAPL').
 
     Returns:
-        DataFrame with at least a 'Date' column (datetime) if the file exists,
-        or an empty DataFrame otherwise.
+        DataFrame with 'Date' (datetime), 'DateStr' ('MM/DD/YYYY') and 'Close'
+        columns, indexed by a sorted DatetimeIndex of the same dates, if the
+        file exists; an empty DataFrame otherwise.
     """
-    csv_path = os.path.join(DATA_DIR, f"{ticker}.csv")
-    if not os.path.exists(csv_path):
+    path = cache_path(ticker)
+    if not os.path.exists(path):
         return pd.DataFrame()
-    df = pd.read_csv(csv_path, parse_dates=["Date"])
+    df = pd.read_parquet(path, columns=CACHE_COLUMNS)
+    # Sorted DatetimeIndex lets filter_by_date slice by binary search
+    df = df.set_index("Date", drop=False).rename_axis(None).sort_index()
+    # Chart x-axis labels, formatted once per load instead of per request
+    df["DateStr"] = df["Date"].dt.strftime("%m/%d/%Y")
     return df
 
 
+@lru_cache(maxsize=256)
+def parse_date(value):
+    """Parse an ISO date string 'YYYY-MM-DD' to a Timestamp (NaT if blank)."""
+    return pd.Timestamp(value)
+
+
 def filter_by_date(df, start, end):
     """
     Return rows with Date between start and end (inclusive).
 
     Args:
-        df: DataFrame containing a 'Date' column.
-        start: ISO date string 'YYYY-MM-DD'.
-        end: ISO date string 'YYYY-MM-DD'.
+        df: DataFrame from load_data (sorted DatetimeIndex).
+        start: Timestamp (or ISO date string 'YYYY-MM-DD').
+        end: Timestamp (or ISO date string 'YYYY-MM-DD').
 
     Returns:
-        A DataFrame slice within the requested date range.
-        If input is empty or lacks 'Date', returns an empty DataFrame.
+        A DataFrame slice (not a copy) within the requested date range.
+        If input is empty or not date-indexed, returns an empty DataFrame.
     """
-    if "Date" not in df or df.empty:
+    if df.empty or not isinstance(df.index, pd.DatetimeIndex):
         return pd.DataFrame()
-    df = df.copy()
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    mask = (df["Date"] >= pd.to_datetime(start)) & (df["Date"] <= pd.to_datetime(end))
-    return df.loc[mask]
+    # Handlers pass Timestamps already; only strings need parsing
+    start_ts = start if isinstance(start, pd.Timestamp) else parse_date(start)
+    end_ts = end if isinstance(end, pd.Timestamp) else parse_date(end)
+    if pd.isna(start_ts) or pd.isna(end_ts):
+        return df.iloc[0:0]
+    # Binary search on the sorted index; iloc returns a view, no copy or reparse
+    i = df.index.searchsorted(start_ts, side="left")
+    j = df.index.searchsorted(end_ts, side="right")
+    return df.iloc[i:j]
+
+
+@lru_cache(maxsize=256)
+def get_filtered(ticker, start, end):
+    """
+    Return load_data(ticker) filtered to [start, end], memoized per range.
+
+    start/end are Timestamps from parse_date (strings also work).
+
+    Repeated stat toggles over the same visible range hit this cache instead of
+    re-slicing. Like load_data, the returned frame is shared and must not be
+    mutated in place; download_data clears the cache.
+    """
+    return filter_by_date(load_data(ticker), start, end)
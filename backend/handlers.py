@@ -2,22 +2,74 @@
 PyLinkJS handlers: connect frontend requests to backend logic.
 
 Flow:
-  - ready: Called when the page loads. Computes defaults and calls JS initApp.
+  - refresh_defaults: Precomputes ready's payload; run at startup and after downloads.
+  - ready: Called when the page loads. Sends the cached defaults to JS initApp.
   - get_plot_data: Filters a ticker's data for the chosen range and returns X/Y series.
   - get_stat_value: Computes stats over the filtered Close prices and returns overlay lines.
+    Stats are dispatched through the STATS dict.
 
 Conventions:
-  - Python → JS calls are made with jsc.eval_js_code("window.fnName(...)").
+  - Python → JS calls are made with jsc.eval_js_code("window.fnName(...)"),
+    with arguments serialized by orjson (see _call_js).
   - JS → Python calls use call_py('handler_name', ...).
   - Only Std Dev returns a per-stat error ('Only one price point') when n == 1.
 """
 
 import os
-import pandas as pd
 import numpy as np
+import orjson
 from datetime import date, timedelta
-from .config import TICKERS, DATA_DIR
-from .data import load_data, filter_by_date
+from .config import TICKERS
+from .data import cache_path, load_data, get_filtered, parse_date
+from .kernels import mean_std
+
+# (available tickers, default start 'YYYY-MM-DD', default end 'YYYY-MM-DD')
+DEFAULTS = None
+
+
+def _call_js(jsc, fn, *args):
+    """
+    Invoke window.<fn>(...) in the browser with JSON-encoded arguments.
+
+    NumPy arrays are serialized directly from their buffers; NaN becomes null.
+    """
+    js_args = ",".join(
+        orjson.dumps(a, option=orjson.OPT_SERIALIZE_NUMPY).decode() for a in args
+    )
+    jsc.eval_js_code(f"window.{fn}({js_args});")
+
+
+def refresh_defaults():
+    """
+    Compute the available tickers and default date window once.
+
+    The tickers and dates only change when data is downloaded, so this runs
+    once per download (see app.refresh_data) instead of per page load.
+    """
+    global DEFAULTS
+    tickers = [t for t in TICKERS if os.path.exists(cache_path(t))]
+
+    # Per-ticker min/max on datetime64 arrays; no per-row Python objects
+    mins, maxs = [], []
+    for t in tickers:
+        df = load_data(t)
+        if df.empty:
+            continue
+        d = df["Date"].to_numpy(dtype="datetime64[ns]")
+        if d.size:
+            mins.append(d.min())
+            maxs.append(d.max())
+
+    if maxs:
+        default_end = max(maxs).astype("datetime64[D]").item()
+        earliest = min(mins).astype("datetime64[D]").item()
+        default_start = max(earliest, default_end - timedelta(days=30))
+    else:
+        default_end = date.today()
+        default_start = default_end - timedelta(days=30)
+
+    # Dates to strings for the date inputs
+    DEFAULTS = (tickers, str(default_start), str(default_end))
 
 
 def ready(jsc, origin, pathname, search, *args):
@@ -25,20 +77,14 @@ def ready(jsc, origin, pathname, search, *args):
     Initialize the frontend by sending available tickers and default dates.
 
     The default window is the latest 30 days within the union of all available
-    ticker datasets (if any are present).
+    ticker datasets (if any are present). Values come from refresh_defaults.
 
     JS callback:
         window.initApp(tickerList: string[], defaultStart: 'YYYY-MM-DD', defaultEnd: 'YYYY-MM-DD')
     """
-    tickers = [t for t in TICKERS if os.path.exists(os.path.join(DATA_DIR, f"{t}.csv"))]
-
-    default_end = date.today()
-    default_start = default_end - timedelta(days=30)
-
-    # Dates to strings for the date inputs
-    jsc.eval_js_code(
-        f"window.initApp({tickers}, '{default_start}', '{default_end}');"
-    )
+    if DEFAULTS is None:
+        refresh_defaults()
+    _call_js(jsc, "initApp", *DEFAULTS)
 
 
 def get_plot_data(jsc, ticker, start, end):
@@ -50,17 +96,46 @@ def get_plot_data(jsc, ticker, start, end):
     """
     df = load_data(ticker)
     if df.empty:
-        jsc.eval_js_code("window.plotStockData([], [], 'No data available');")
+        _call_js(jsc, "plotStockData", [], [], "No data available")
         return
 
-    filtered = filter_by_date(df, start, end)
+    # Parse the date inputs once per call; reused by the filter cache key
+    start_ts, end_ts = parse_date(start), parse_date(end)
+    filtered = get_filtered(ticker, start_ts, end_ts)
     if filtered.empty or "Close" not in filtered:
-        jsc.eval_js_code("window.plotStockData([], [], 'No data for selected range');")
+        _call_js(jsc, "plotStockData", [], [], "No data for selected range")
         return
 
-    x = [pd.to_datetime(d).strftime("%m/%d/%Y") for d in filtered["Date"]]
-    y = [float(c) if pd.notna(c) else None for c in filtered["Close"]]
-    jsc.eval_js_code(f"window.plotStockData({x}, {y}, null);")
+    # Labels are preformatted by load_data; orjson writes NaN prices as null
+    x = filtered["DateStr"].tolist()
+    y = np.ascontiguousarray(filtered["Close"].to_numpy())
+    _call_js(jsc, "plotStockData", x, y, None)
+
+
+def _stat_mean(price):
+    """Mean line: (mean, null, null)."""
+    return float(price.mean()), None, None
+
+
+def _stat_median(price):
+    """Median line: (median, null, null)."""
+    return float(np.median(price)), None, None
+
+
+def _stat_std(price):
+    """Std band: (mean + std, mean - std, null), or an error for a single point."""
+    if price.size == 1:
+        return None, None, "Only one price point"
+    mean, std, _ = mean_std(price)  # sample std (ddof=1), fused single pass
+    return float(mean + std), float(mean - std), None
+
+
+# Stat name -> fn(finite prices) returning (upper, lower, errorMsg) for drawStatLine
+STATS = {
+    "mean": _stat_mean,
+    "median": _stat_median,
+    "std": _stat_std,
+}
 
 
 def get_stat_value(jsc, ticker, start, end, stat):
@@ -84,40 +159,31 @@ def get_stat_value(jsc, ticker, start, end, stat):
     """
     df = load_data(ticker)
     if df.empty:
-        jsc.eval_js_code(f"window.drawStatLine('{stat}', null, null, null);")
+        _call_js(jsc, "drawStatLine", stat, None, None, None)
         return
 
-    filtered = filter_by_date(df, start, end)
-    price = pd.to_numeric(filtered.get("Close", pd.Series(dtype=float)), errors="coerce") \
-               .replace([np.inf, -np.inf], np.nan).dropna()
-
-    if price.empty:
-        jsc.eval_js_code(f"window.drawStatLine('{stat}', null, null, null);")
+    # Parse the date inputs once per call; reused by the filter cache key
+    start_ts, end_ts = parse_date(start), parse_date(end)
+    filtered = get_filtered(ticker, start_ts, end_ts)
+    if "Close" not in filtered:
+        _call_js(jsc, "drawStatLine", stat, None, None, None)
         return
 
-    s = stat.lower()
+    # Plain ndarray of finite prices; skips pandas Series overhead. Mask in the
+    # cached dtype (float32) first so only the compacted array is upcast.
+    price = filtered["Close"].to_numpy()
+    price = price[np.isfinite(price)].astype(np.float64, copy=False)
 
-    if s == "mean":
-        val = float(price.mean())
-        jsc.eval_js_code(f"window.drawStatLine('mean', {val}, null, null);")
+    if price.size == 0:
+        _call_js(jsc, "drawStatLine", stat, None, None, None)
         return
 
-    if s == "median":
-        val = float(price.median())
-        jsc.eval_js_code(f"window.drawStatLine('median', {val}, null, null);")
-        return
-
-    if s == "std":
-        n = len(price)
-        if n == 1:
-            jsc.eval_js_code("window.drawStatLine('std', null, null, 'Only one price point');")
-            return
-        mean = price.mean()
-        std = price.std()  # sample std (ddof=1). For population, use price.std(ddof=0).
-        upper = float(mean + std)
-        lower = float(mean - std)
-        jsc.eval_js_code(f"window.drawStatLine('std', {upper}, {lower}, null);")
+    s = stat.lower()
+    fn = STATS.get(s)
+    if fn is None:
+        # Unknown stat: silently no-op (could log if desired)
+        _call_js(jsc, "drawStatLine", stat, None, None, None)
         return
 
-    # Unknown stat: silently no-op (could log if desired)
-    jsc.eval_js_code(f"window.drawStatLine('{stat}', null, null, null);")
+    upper, lower, err = fn(price)
+    _call_js(jsc, "drawStatLine", s, upper, lower, err)
@@ -0,0 +1,45 @@
+"""
+Numba-compiled numeric kernels used by the handlers.
+
+- mean_std: single-pass mean and sample standard deviation of finite values.
+- warm_up: trigger JIT compilation ahead of the first request.
+"""
+
+import math
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def mean_std(a):
+    """
+    Compute mean and sample std (ddof=1) over the finite values of a in one pass.
+
+    Uses Welford's update so large prices don't lose precision to cancellation.
+
+    Args:
+        a: 1-D float64 ndarray (NaN/inf entries are ignored).
+
+    Returns:
+        (mean, std, n) where n is the count of finite values. mean is NaN when
+        n == 0 and std is NaN when n < 2.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in a:
+        if math.isfinite(x):
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+    if n == 0:
+        return math.nan, math.nan, 0
+    if n == 1:
+        return mean, math.nan, 1
+    return mean, math.sqrt(m2 / (n - 1)), n
+
+
+def warm_up():
+    """Compile (or load cached) kernels so the first user request doesn't pay JIT cost."""
+    mean_std(np.zeros(2, dtype=np.float64))